@@ -1,16 +1,103 @@
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from itertools import islice
 
-_LOG_BUFFER: list[str] = []
+_LOG_ENABLED = True
+_LOG_MAXLEN = 10_000
+_LOG_BUFFER: deque[tuple[str, str, tuple]] = deque(maxlen=_LOG_MAXLEN)
 
+# Cleaning runs on worker threads, so appends and the sequence counter
+# must move together.
+_lock = threading.Lock()
+_log_seq: int = 0  # total entries ever logged; never reset
 
-def log(message: str) -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    _LOG_BUFFER.append(f"[{timestamp}] {message}")
+_dirty: bool = False
+_joined: str = ""
+
+# Arguments of these types are immutable and hold no references, so they
+# can be stored as-is and formatted later.
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_last_ts_sec: int = -1
+_last_ts_str: str = ""
+
+
+def _timestamp() -> str:
+    # Log calls come in bursts (adding/cleaning many rows), so format the
+    # timestamp at most once per second.
+    global _last_ts_sec, _last_ts_str
+    t = int(time.time())
+    if t != _last_ts_sec:
+        _last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+        _last_ts_sec = t
+    return _last_ts_str
+
+
+def log(fmt: str, *args) -> None:
+    global _log_seq, _dirty
+    if not _LOG_ENABLED:
+        return
+    # Anything else (exceptions with their tracebacks, rules dicts, Paths)
+    # is stringified now: keeping it would pin its frames/locals for the
+    # life of the entry, and it may still be mutated by the logging thread.
+    if args and not all(type(a) in _PLAIN_TYPES for a in args):
+        args = tuple(a if type(a) in _PLAIN_TYPES else str(a) for a in args)
+    with _lock:
+        _LOG_BUFFER.append((_timestamp(), fmt, args))
+        _log_seq += 1
+        _dirty = True
+
+
+def _format(entry: tuple[str, str, tuple]) -> str:
+    timestamp, fmt, args = entry
+    return f"[{timestamp}] {fmt % args if args else fmt}"
 
 
 def get_log() -> str:
-    return "\n".join(_LOG_BUFFER)
+    global _dirty, _joined
+    with _lock:
+        if _dirty:
+            _joined = "\n".join(_format(entry) for entry in _LOG_BUFFER)
+            _dirty = False
+        return _joined
+
+
+def iter_log():
+    """Yield formatted log lines one at a time, oldest first."""
+    # Snapshot the entries (not their text) so workers can keep logging
+    # while the caller consumes the generator.
+    with _lock:
+        entries = list(_LOG_BUFFER)
+    for entry in entries:
+        yield _format(entry)
+
+
+def append_log(widget, cursor: int) -> int:
+    """Bring ``widget`` (a QTextEdit) up to date with the log.
+
+    ``cursor`` is the value returned by the previous call (0 initially).
+    Only entries logged since then are appended; if some of them have
+    already been dropped from the buffer, or the log was cleared, the
+    widget is re-filled from scratch. Returns the new cursor.
+    """
+    with _lock:
+        seq = _log_seq
+        first = seq - len(_LOG_BUFFER)
+        if cursor < first:
+            tail = None
+        else:
+            tail = [_format(e) for e in islice(_LOG_BUFFER, cursor - first, None)]
+    if tail is None:
+        widget.setPlainText(get_log())
+    elif tail:
+        widget.append("\n".join(tail))
+    return seq
 
 
 def clear_log() -> None:
-    _LOG_BUFFER.clear()
+    global _dirty, _joined
+    with _lock:
+        _LOG_BUFFER.clear()
+        _dirty = False
+        _joined = ""
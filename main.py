@@ -1,4 +1,7 @@
+import io
+import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -9,15 +12,29 @@ from PySide6.QtWidgets import (
     QDialog, QTextEdit, QCheckBox, QLabel, QStackedWidget,
     QSplitter
 )
-from PySide6.QtCore import Qt, QPropertyAnimation, QRect, QSize
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtCore import (
+    Qt, QPropertyAnimation, QRect, QSize, QTimer,
+    QObject, QRunnable, QThreadPool, Signal
+)
+from PySide6.QtGui import QPixmap, QImage, QIcon
 
 from metadata_cleaner import (
-    clean_file, get_file_type,
+    clean_file, clean_file_with_diff, get_file_types,
     extract_metadata, compare_metadata
 )
-from logger import log, get_log, clear_log
+from logger import log, iter_log, append_log, clear_log
+
+_EXPLORER = shutil.which("explorer") or r"C:\Windows\explorer.exe"
 
+# Above this many entries, QTextEdit's HTML parser dominates; show plain text.
+_METADATA_HTML_MAX_ENTRIES = 200
+
+_ICON_PREFIX = {
+    "image": "🖼 ",
+    "media": "🎞 ",
+    "pdf": "📄 ",
+    "other": "❔ ",
+}
 
 DARK_STYLESHEET = """
 QWidget {
@@ -122,28 +139,52 @@ QTextEdit {
 """
 
 
+def _open_folder(folder: str) -> None:
+    # os.startfile hands the folder to the shell and returns immediately,
+    # without spawning a child process we would then abandon.
+    if hasattr(os, "startfile"):
+        os.startfile(folder)
+    else:
+        subprocess.Popen([_EXPLORER, folder])
+
+
+def _path_key(path: str) -> str:
+    # Windows paths are case-insensitive and may mix separators.
+    return os.path.normcase(os.path.abspath(path))
+
+
 class MetadataDialog(QDialog):
     def __init__(self, metadata: dict, title="Metadata Viewer", parent=None):
         super().__init__(parent)
-        self.setWindowTitle(title)
 
         layout = QVBoxLayout()
-        text = QTextEdit()
-        text.setReadOnly(True)
-
-        if metadata:
-            formatted = "<br>".join(f"<b>{k}:</b> {v}" for k, v in metadata.items())
-        else:
-            formatted = "No metadata found."
-
-        text.setHtml(formatted)
-        layout.addWidget(text)
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        layout.addWidget(self.text)
 
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
 
         self.setLayout(layout)
+        self.set_metadata(metadata, title)
+
+    def set_metadata(self, metadata: dict, title="Metadata Viewer"):
+        self.setWindowTitle(title)
+        if not metadata:
+            self.text.setPlainText("No metadata found.")
+            return
+        if len(metadata) > _METADATA_HTML_MAX_ENTRIES:
+            self.text.setPlainText("\n".join(f"{k}: {v}" for k, v in metadata.items()))
+            return
+        buf = io.StringIO()
+        for k, v in metadata.items():
+            buf.write("<b>")
+            buf.write(str(k))
+            buf.write(":</b> ")
+            buf.write(str(v))
+            buf.write("<br>")
+        self.text.setHtml(buf.getvalue())
 
 
 class LogWindow(QDialog):
@@ -172,13 +213,15 @@ class LogWindow(QDialog):
         self.clear_btn.clicked.connect(self.clear_log)
         self.save_btn.clicked.connect(self.save_log)
 
+        self._log_cursor = 0
         self.refresh()
 
     def refresh(self):
-        self.text.setPlainText(get_log())
+        self._log_cursor = append_log(self.text, self._log_cursor)
 
     def clear_log(self):
         clear_log()
+        self.text.clear()
         self.refresh()
 
     def save_log(self):
@@ -186,8 +229,8 @@ class LogWindow(QDialog):
         if not path:
             return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(get_log())
+            with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.writelines(line + "\n" for line in iter_log())
             QMessageBox.information(self, "Saved", "Log saved successfully.")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not save log: {e}")
@@ -206,65 +249,52 @@ class SettingsWindow(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Settings")
 
-        self._rules = rules.copy()
-
         layout = QVBoxLayout()
 
         layout.addWidget(QLabel("Output options:"))
         self.output_overwrite = QCheckBox(
             "Overwrite original files instead of creating _cleaned copies"
         )
-        self.output_overwrite.setChecked(overwrite_files)
         layout.addWidget(self.output_overwrite)
 
         self.confirm_overwrite = QCheckBox(
             "Ask for confirmation before overwriting originals"
         )
-        self.confirm_overwrite.setChecked(confirm_overwrite)
         layout.addWidget(self.confirm_overwrite)
 
         layout.addWidget(QLabel("Post-processing:"))
         self.show_removed_dialog = QCheckBox(
             "Show 'Metadata Removed' dialog after cleaning"
         )
-        self.show_removed_dialog.setChecked(show_removed_dialog)
         layout.addWidget(self.show_removed_dialog)
 
         self.auto_open_folder = QCheckBox(
             "Open output folder after cleaning finishes"
         )
-        self.auto_open_folder.setChecked(auto_open_folder)
         layout.addWidget(self.auto_open_folder)
 
         layout.addSpacing(10)
         layout.addWidget(QLabel("Power User: Metadata Rules"))
 
         self.remove_gps_cb = QCheckBox("Remove GPS/location metadata")
-        self.remove_gps_cb.setChecked(self._rules.get("remove_gps", True))
         layout.addWidget(self.remove_gps_cb)
 
         self.remove_ts_cb = QCheckBox("Remove timestamps (DateTime, DateTimeOriginal, CreateDate)")
-        self.remove_ts_cb.setChecked(self._rules.get("remove_timestamps", True))
         layout.addWidget(self.remove_ts_cb)
 
         self.remove_cam_cb = QCheckBox("Remove camera info (Make, Model, Lens)")
-        self.remove_cam_cb.setChecked(self._rules.get("remove_camera", True))
         layout.addWidget(self.remove_cam_cb)
 
         self.remove_xmp_cb = QCheckBox("Remove XMP metadata")
-        self.remove_xmp_cb.setChecked(self._rules.get("remove_xmp", True))
         layout.addWidget(self.remove_xmp_cb)
 
         self.remove_iptc_cb = QCheckBox("Remove IPTC metadata")
-        self.remove_iptc_cb.setChecked(self._rules.get("remove_iptc", True))
         layout.addWidget(self.remove_iptc_cb)
 
         self.keep_icc_cb = QCheckBox("Keep ICC color profile")
-        self.keep_icc_cb.setChecked(self._rules.get("keep_icc", True))
         layout.addWidget(self.keep_icc_cb)
 
         self.keep_orientation_cb = QCheckBox("Keep orientation tag")
-        self.keep_orientation_cb.setChecked(self._rules.get("keep_orientation", True))
         layout.addWidget(self.keep_orientation_cb)
 
         layout.addSpacing(10)
@@ -275,6 +305,31 @@ class SettingsWindow(QDialog):
         layout.addWidget(save_btn)
 
         self.setLayout(layout)
+        self.set_values(
+            overwrite_files, show_removed_dialog, confirm_overwrite,
+            auto_open_folder, rules,
+        )
+
+    def set_values(
+        self,
+        overwrite_files: bool,
+        show_removed_dialog: bool,
+        confirm_overwrite: bool,
+        auto_open_folder: bool,
+        rules: dict,
+    ):
+        self._rules = rules.copy()
+        self.output_overwrite.setChecked(overwrite_files)
+        self.confirm_overwrite.setChecked(confirm_overwrite)
+        self.show_removed_dialog.setChecked(show_removed_dialog)
+        self.auto_open_folder.setChecked(auto_open_folder)
+        self.remove_gps_cb.setChecked(self._rules.get("remove_gps", True))
+        self.remove_ts_cb.setChecked(self._rules.get("remove_timestamps", True))
+        self.remove_cam_cb.setChecked(self._rules.get("remove_camera", True))
+        self.remove_xmp_cb.setChecked(self._rules.get("remove_xmp", True))
+        self.remove_iptc_cb.setChecked(self._rules.get("remove_iptc", True))
+        self.keep_icc_cb.setChecked(self._rules.get("keep_icc", True))
+        self.keep_orientation_cb.setChecked(self._rules.get("keep_orientation", True))
 
     def get_settings(self):
         rules = {
@@ -300,7 +355,14 @@ class PreviewPanel(QWidget):
         super().__init__(parent)
         self.setObjectName("previewPanel")
 
-        self._original_pixmap: QPixmap | None = None
+        self._original_image: QImage | None = None
+        self._scaled_cache: tuple[QSize, QPixmap] | None = None
+
+        # Coalesce splitter/window drag resizes into a single rescale.
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self._scale_pixmap)
 
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -333,19 +395,23 @@ class PreviewPanel(QWidget):
     def resizeEvent(self, event):
         super().resizeEvent(event)
         if self.stack.currentWidget() is self.image_label:
-            self._scale_pixmap()
+            self._resize_timer.start()
 
     def _scale_pixmap(self):
-        if not self._original_pixmap:
+        if self._original_image is None:
             return
         size = self.image_label.size()
         if size.width() <= 0 or size.height() <= 0:
             return
-        scaled = self._original_pixmap.scaled(
-            size,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
+        if self._scaled_cache is not None and self._scaled_cache[0] == size:
+            scaled = self._scaled_cache[1]
+        else:
+            scaled = QPixmap.fromImage(self._original_image.scaled(
+                size,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            ))
+            self._scaled_cache = (QSize(size), scaled)
         self.image_label.setPixmap(scaled)
 
     def show_preview(self, path: str, file_type: str):
@@ -358,17 +424,19 @@ class PreviewPanel(QWidget):
             self._show_empty()
 
     def _show_image(self, path: str):
-        pix = QPixmap(path)
-        if pix.isNull():
-            log(f"Failed to load image preview for {path}")
+        image = QImage(path)
+        if image.isNull():
+            log("Failed to load image preview for %s", path)
             self._show_text_summary(path, "image")
             return
-        self._original_pixmap = pix
+        self._original_image = image
+        self._scaled_cache = None
         self.stack.setCurrentWidget(self.image_label)
         self._scale_pixmap()
 
     def _show_text_summary(self, path: str, file_type: str):
-        self._original_pixmap = None
+        self._original_image = None
+        self._scaled_cache = None
         info = [
             f"File: {Path(path).name}",
             f"Type: {file_type}",
@@ -378,12 +446,69 @@ class PreviewPanel(QWidget):
         self.stack.setCurrentWidget(self.text_preview)
 
     def _show_empty(self):
-        self._original_pixmap = None
+        self._original_image = None
+        self._scaled_cache = None
         self.stack.setCurrentWidget(self.empty_label)
         self.title_label.setText("Preview")
 
 
+class CleanTaskSignals(QObject):
+    rowStarted = Signal(int)
+    # row, ok, out_path, removed, msg
+    rowDone = Signal(int, bool, str, object, str)
+
+
+class CleanTask(QRunnable):
+    """Cleans a single table row on a QThreadPool worker thread.
+
+    Only plain values go in and out; all widget updates happen in the slot
+    connected to ``signals.rowDone``, which runs on the GUI thread.
+    """
+
+    def __init__(self, row: int, path: str,
+                 overwrite: bool, lossless: bool, rules: dict,
+                 want_diff: bool = True):
+        super().__init__()
+        # MainWindow keeps the task alive until its batch finishes.
+        self.setAutoDelete(False)
+        self.row = row
+        self.path = path
+        self.overwrite = overwrite
+        self.lossless = lossless
+        self.rules = rules
+        self.want_diff = want_diff
+        self.signals = CleanTaskSignals()
+
+    def run(self):
+        self.signals.rowStarted.emit(self.row)
+        try:
+            # The before/after snapshots only feed the "Metadata Removed"
+            # dialog, so skip both probes when nobody will look at the diff.
+            removed = {}
+            if self.want_diff:
+                ok, msg, out_path, before, after = clean_file_with_diff(
+                    self.path,
+                    overwrite=self.overwrite,
+                    lossless=self.lossless,
+                    rules=self.rules,
+                )
+                if ok:
+                    removed = compare_metadata(before, after)
+            else:
+                ok, msg, out_path = clean_file(
+                    self.path,
+                    overwrite=self.overwrite,
+                    lossless=self.lossless,
+                    rules=self.rules,
+                )
+        except Exception as e:
+            ok, msg, out_path, removed = False, str(e), self.path, {}
+        self.signals.rowDone.emit(self.row, ok, out_path, removed, msg)
+
+
 class MainWindow(QMainWindow):
+    cleaningFinished = Signal()
+
     def __init__(self):
         super().__init__()
 
@@ -392,6 +517,12 @@ class MainWindow(QMainWindow):
         self.resize(1000, 650)
 
         self.current_theme = "dark"
+        self._applied_theme: str | None = None
+
+        self._metadata_dialog: MetadataDialog | None = None
+        self._log_window: LogWindow | None = None
+        self._settings_window: SettingsWindow | None = None
+
         self.overwrite_files = False
         self.show_removed_dialog = True
         self.confirm_overwrite = True
@@ -487,6 +618,16 @@ class MainWindow(QMainWindow):
         self.lossless_checkbox.stateChanged.connect(self.update_lossless_state)
         self.view_log_button.clicked.connect(self.open_log_window)
         self.table.selectionModel().selectionChanged.connect(self.update_preview_from_selection)
+        self.cleaningFinished.connect(self._finish_clean, Qt.QueuedConnection)
+
+        # Rubber-band selection fires selectionChanged for every step; only
+        # decode the preview once the selection has settled.
+        self._pending_preview_row: int | None = None
+        self._last_preview_path: str | None = None
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(80)
+        self._preview_timer.timeout.connect(self._do_update_preview)
 
         self.apply_theme(self.current_theme)
         log("Application started")
@@ -500,15 +641,18 @@ class MainWindow(QMainWindow):
         self._fade_anim.start()
 
     def apply_theme(self, theme: str):
-        if theme == "dark":
-            self.setStyleSheet(DARK_STYLESHEET)
-            self.current_theme = "dark"
-            self.theme_button.setText("🌘")
-        else:
-            self.setStyleSheet(LIGHT_STYLESHEET)
-            self.current_theme = "light"
-            self.theme_button.setText("☀")
-        log(f"Theme applied: {self.current_theme}")
+        theme = "dark" if theme == "dark" else "light"
+        if theme == self._applied_theme:
+            return
+        # Set on the application so every window and dialog is polished
+        # once, rather than re-styling this window's widget tree per toggle.
+        QApplication.instance().setStyleSheet(
+            DARK_STYLESHEET if theme == "dark" else LIGHT_STYLESHEET
+        )
+        self.current_theme = theme
+        self._applied_theme = theme
+        self.theme_button.setText("🌘" if theme == "dark" else "☀")
+        log("Theme applied: %s", self.current_theme)
 
     def toggle_theme(self):
         new_theme = "light" if self.current_theme == "dark" else "dark"
@@ -526,38 +670,75 @@ class MainWindow(QMainWindow):
 
     def update_lossless_state(self, state):
         self.lossless_clean = state == Qt.Checked
-        log(f"Lossless clean set to: {self.lossless_clean}")
+        log("Lossless clean set to: %s", self.lossless_clean)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
 
     def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            path = url.toLocalFile()
-            if path:
-                self.add_file_row(path)
+        paths = [url.toLocalFile() for url in event.mimeData().urls()]
+        self.add_file_rows([p for p in paths if p])
 
     def add_files(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Select files", str(Path.home()))
-        for f in files:
-            self.add_file_row(f)
+        self.add_file_rows(files)
+
+    def add_file_rows(self, paths):
+        # Rows are cleaned concurrently, and two rows for one file would
+        # write (and replace the original with) the same output file, so a
+        # path is only ever listed once.
+        seen = {
+            _path_key(self.table.item(row, 0).text())
+            for row in range(self.table.rowCount())
+        }
+        unique = []
+        for path in paths:
+            key = _path_key(path)
+            if key in seen:
+                log("Skipping duplicate file: %s", path)
+                continue
+            seen.add(key)
+            unique.append(path)
+        paths = unique
+        if not paths:
+            return
 
-    def add_file_row(self, path):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
+        # Suspend repaints, signals, sorting and per-insert header resizing
+        # so a large drop costs one layout pass instead of one per file.
+        header = self.table.horizontalHeader()
+        resize_modes = [
+            header.sectionResizeMode(col) for col in range(self.table.columnCount())
+        ]
+        sorting = self.table.isSortingEnabled()
+
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        self.table.setSortingEnabled(False)
+        for col in range(len(resize_modes)):
+            header.setSectionResizeMode(col, QHeaderView.Interactive)
 
+        try:
+            file_types = get_file_types(Path(p) for p in paths)
+            first_row = self.table.rowCount()
+            self.table.setRowCount(first_row + len(paths))
+            for row, (path, file_type_raw) in enumerate(zip(paths, file_types), start=first_row):
+                self._fill_row(row, path, file_type_raw)
+        finally:
+            for col, mode in enumerate(resize_modes):
+                header.setSectionResizeMode(col, mode)
+            self.table.setSortingEnabled(sorting)
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
+
+    def _fill_row(self, row, path, file_type_raw):
         file_item = QTableWidgetItem(path)
         file_item.setFlags(file_item.flags() ^ Qt.ItemIsEditable)
 
-        file_type_raw = get_file_type(Path(path))
-        icon_prefix = {
-            "image": "🖼 ",
-            "media": "🎞 ",
-            "pdf": "📄 ",
-            "other": "❔ ",
-        }.get(file_type_raw, "")
+        icon_prefix = _ICON_PREFIX.get(file_type_raw, "")
         type_item = QTableWidgetItem(icon_prefix + file_type_raw)
+        type_item.setData(Qt.UserRole, file_type_raw)
         type_item.setFlags(type_item.flags() ^ Qt.ItemIsEditable)
 
         status_item = QTableWidgetItem("Pending")
@@ -571,7 +752,7 @@ class MainWindow(QMainWindow):
         self.table.setItem(row, 2, status_item)
         self.table.setItem(row, 3, output_item)
 
-        log(f"File added to table: {path}")
+        log("File added to table: %s", path)
 
     def remove_selected_rows(self):
         selected_rows = sorted({i.row() for i in self.table.selectedIndexes()}, reverse=True)
@@ -582,17 +763,25 @@ class MainWindow(QMainWindow):
             path_item = self.table.item(row, 0)
             path = path_item.text() if path_item else ""
             self.table.removeRow(row)
-            log(f"Row removed from table: {path}")
+            log("Row removed from table: %s", path)
 
     def update_preview_from_selection(self, selected, deselected):
         indexes = self.table.selectedIndexes()
-        if not indexes:
+        self._pending_preview_row = indexes[0].row() if indexes else None
+        self._preview_timer.start()
+
+    def _do_update_preview(self):
+        row = self._pending_preview_row
+        path_item = self.table.item(row, 0) if row is not None else None
+        if path_item is None:
+            self._last_preview_path = None
             self.preview_panel._show_empty()
             return
-        row = indexes[0].row()
-        path = self.table.item(row, 0).text()
-        type_text = self.table.item(row, 1).text()
-        file_type = type_text.split(" ", 1)[-1]
+        path = path_item.text()
+        if path == self._last_preview_path:
+            return
+        self._last_preview_path = path
+        file_type = self.table.item(row, 1).data(Qt.UserRole)
         self.preview_panel.show_preview(path, file_type)
 
     def view_metadata(self):
@@ -603,12 +792,19 @@ class MainWindow(QMainWindow):
 
         row = selected[0].row()
         path = self.table.item(row, 0).text()
-        type_text = self.table.item(row, 1).text()
-        file_type = type_text.split(" ", 1)[-1]
+        file_type = self.table.item(row, 1).data(Qt.UserRole)
 
         metadata = extract_metadata(path, file_type)
-        dialog = MetadataDialog(metadata, "Metadata Viewer", self)
-        dialog.exec()
+        self._show_metadata_dialog(metadata, "Metadata Viewer")
+
+    def _show_metadata_dialog(self, metadata: dict, title: str):
+        # One dialog is kept and refilled; a batch clean with the
+        # "Metadata Removed" popup on would otherwise build one per file.
+        if self._metadata_dialog is None:
+            self._metadata_dialog = MetadataDialog(metadata, title, self)
+        else:
+            self._metadata_dialog.set_metadata(metadata, title)
+        self._metadata_dialog.exec()
 
     def clean_selected(self):
         rows = sorted({i.row() for i in self.table.selectedIndexes()})
@@ -642,61 +838,92 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.No:
                 local_overwrite = False
 
-        first_output_folder = None
+        self._clean_rows_order = list(rows)
+        # Settings stay editable during a batch; the diffs are computed (or
+        # not) per task at queue time, so the dialogs must follow that.
+        self._clean_want_diff = self.show_removed_dialog
+        self._clean_results = {}
+        self._clean_tasks = []
+        self._set_cleaning(True)
 
-        for i, row in enumerate(rows, start=1):
+        pool = QThreadPool.globalInstance()
+        for row in rows:
             path = self.table.item(row, 0).text()
-            type_text = self.table.item(row, 1).text()
-            file_type = type_text.split(" ", 1)[-1]
-
-            status_item = self.table.item(row, 2)
-            output_item = self.table.item(row, 3)
-
-            before = extract_metadata(path, file_type)
-
-            status_item.setText("Cleaning...")
-            QApplication.processEvents()
+            self.table.item(row, 2).setText("Queued")
 
-            ok, msg, out_path = clean_file(
-                path,
+            task = CleanTask(
+                row, path,
                 overwrite=local_overwrite,
                 lossless=self.lossless_clean,
-                rules=self.rules,
+                rules=dict(self.rules),
+                want_diff=self._clean_want_diff,
             )
+            task.signals.rowStarted.connect(self._on_row_started)
+            task.signals.rowDone.connect(self._on_row_cleaned)
+            self._clean_tasks.append(task)
+            pool.start(task)
 
-            after = extract_metadata(out_path, file_type) if ok else {}
-            removed = compare_metadata(before, after) if ok else {}
+    def _set_cleaning(self, busy: bool):
+        # Row indexes are captured when tasks are queued, so the table must
+        # not be reshuffled until every task has reported back.
+        self.clean_selected_button.setEnabled(not busy)
+        self.clean_all_button.setEnabled(not busy)
+        self.remove_selected_button.setEnabled(not busy)
 
-            status_item.setText("Cleaned" if ok else "Error")
-            output_item.setText(out_path if ok else msg)
+    def _on_row_started(self, row):
+        self.table.item(row, 2).setText("Cleaning...")
 
-            if ok and first_output_folder is None:
-                first_output_folder = str(Path(out_path).parent)
+    def _on_row_cleaned(self, row, ok, out_path, removed, msg):
+        self.table.item(row, 2).setText("Cleaned" if ok else "Error")
+        self.table.item(row, 3).setText(out_path if ok else msg)
+
+        self._clean_results[row] = (ok, out_path, removed)
+        self.progress.setValue(len(self._clean_results))
 
-            if self.show_removed_dialog and ok:
-                dialog = MetadataDialog(removed, "Metadata Removed", self)
-                dialog.exec()
+        if len(self._clean_results) == len(self._clean_rows_order):
+            self.cleaningFinished.emit()
+
+    def _finish_clean(self):
+        first_output_folder = None
+        for row in self._clean_rows_order:
+            ok, out_path, removed = self._clean_results[row]
+            if not ok:
+                continue
+            if first_output_folder is None:
+                first_output_folder = str(Path(out_path).parent)
+            if self._clean_want_diff:
+                self._show_metadata_dialog(removed, "Metadata Removed")
 
-            self.progress.setValue(i)
-            QApplication.processEvents()
+        self._clean_tasks = []
+        self._set_cleaning(False)
 
         QMessageBox.information(self, "Done", "Cleaning finished.")
 
         if self.auto_open_folder and first_output_folder:
             try:
-                subprocess.Popen(["explorer", first_output_folder])
+                _open_folder(first_output_folder)
             except Exception as e:
-                log(f"Failed to open folder {first_output_folder}: {e}")
+                log("Failed to open folder %s: %s", first_output_folder, e)
 
     def open_settings(self):
-        dialog = SettingsWindow(
-            overwrite_files=self.overwrite_files,
-            show_removed_dialog=self.show_removed_dialog,
-            confirm_overwrite=self.confirm_overwrite,
-            auto_open_folder=self.auto_open_folder,
-            rules=self.rules,
-            parent=self,
-        )
+        if self._settings_window is None:
+            self._settings_window = SettingsWindow(
+                overwrite_files=self.overwrite_files,
+                show_removed_dialog=self.show_removed_dialog,
+                confirm_overwrite=self.confirm_overwrite,
+                auto_open_folder=self.auto_open_folder,
+                rules=self.rules,
+                parent=self,
+            )
+        else:
+            self._settings_window.set_values(
+                self.overwrite_files,
+                self.show_removed_dialog,
+                self.confirm_overwrite,
+                self.auto_open_folder,
+                self.rules,
+            )
+        dialog = self._settings_window
         if dialog.exec():
             settings = dialog.get_settings()
             self.overwrite_files = settings["overwrite_files"]
@@ -704,12 +931,15 @@ class MainWindow(QMainWindow):
             self.show_removed_dialog = settings["show_removed_dialog"]
             self.auto_open_folder = settings["auto_open_folder"]
             self.rules = settings["rules"]
-            log(f"Settings updated: {settings}")
+            log("Settings updated: %s", settings)
 
     def open_log_window(self):
-        dlg = LogWindow(self)
-        dlg.resize(700, 400)
-        dlg.exec()
+        if self._log_window is None:
+            self._log_window = LogWindow(self)
+            self._log_window.resize(700, 400)
+        else:
+            self._log_window.refresh()
+        self._log_window.exec()
 
 
 def main():
@@ -1,72 +1,285 @@
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 from PIL import Image, ExifTags
 import pikepdf
 import subprocess
+import functools
+import struct
+import types
+import threading
+import atexit
 import json
+import os
+import mmap
+import multiprocessing.util
+import sys
+import tempfile
+import ctypes
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from logger import log
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speed-up; the stdlib parser accepts bytes too
+    _json_loads = json.loads
+
 EXIFTOOL_PATH = "exiftool"  # Change to full path if needed
 
+_JPEG_SUFFIXES = {".jpg", ".jpeg"}
+
+# The app is built as a GUI (no console) executable on Windows, so every
+# console child would otherwise open its own window.
+_NO_WINDOW = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+
+# -----------------------------
+# EXIFTOOL SESSION
+# -----------------------------
+class ExifToolSession:
+    """A long-lived ``exiftool -stay_open True -@ -`` process.
+
+    Starting exiftool (Perl + tag tables) costs far more than processing a
+    typical file, so one process is kept running and fed commands over
+    stdin. Calls are serialized with a lock, so the session can be shared
+    by the GUI's worker threads.
+    """
+
+    def __init__(self, executable: str = EXIFTOOL_PATH):
+        self._proc = subprocess.Popen(
+            [executable, "-stay_open", "True", "-@", "-",
+             "-common_args", "-charset", "filename=utf8"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=_NO_WINDOW,
+        )
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def execute(self, *args: str) -> tuple[int, bytearray, str]:
+        """Run one exiftool command; returns (status, stdout, stderr)."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            # -echo4 writes to stderr once the command is done, which gives
+            # both an end-of-stderr marker and exiftool's exit status.
+            lines = [*args, "-echo4", f"=${{status}}=post{seq}", f"-execute{seq}"]
+            self._proc.stdin.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            self._proc.stdin.flush()
+
+            stdout, _ = self._read_until(self._proc.stdout, f"{{ready{seq}}}".encode())
+            stderr, status_line = self._read_until(self._proc.stderr, f"=post{seq}".encode())
+
+        status = status_line.rsplit(b"=", 2)[-2]
+        return (
+            int(status) if status.isdigit() else 1,
+            stdout,
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    @staticmethod
+    def _read_until(stream, marker: bytes) -> tuple[bytearray, bytes]:
+        """Read lines up to the one ending in ``marker``; returns (body, marker_line)."""
+        # Lines are appended to one growing buffer as they arrive, so a
+        # large -json dump is never held as a list of lines plus a joined copy.
+        body = bytearray()
+        while True:
+            line = stream.readline()
+            if not line:
+                raise RuntimeError("ExifTool exited unexpectedly")
+            line_end = line.rstrip(b"\r\n")
+            if line_end.endswith(marker):
+                return body, line_end
+            body += line
+
+    def close(self) -> None:
+        if not self.alive:
+            return
+        try:
+            self._proc.stdin.write(b"-stay_open\nFalse\n")
+            self._proc.stdin.flush()
+            self._proc.wait(timeout=5)
+        except Exception:
+            self._proc.kill()
+
+
+_SESSION: ExifToolSession | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> ExifToolSession:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None or not _SESSION.alive:
+            _SESSION = ExifToolSession()
+        return _SESSION
+
+
+@atexit.register
+def _close_session() -> None:
+    if _SESSION is not None:
+        _SESSION.close()
+
+
+def run_exiftool(*args: str) -> tuple[int, bytearray, str]:
+    return _get_session().execute(*args)
+
+
+_EXT_TYPE = {
+    **dict.fromkeys([".jpg", ".jpeg", ".png", ".tiff", ".tif"], "image"),
+    **dict.fromkeys([".mp4", ".mov", ".avi", ".mkv", ".mp3", ".wav", ".flac"], "media"),
+    ".pdf": "pdf",
+}
+
 
 def get_file_type(path: Path) -> str:
-    ext = path.suffix.lower()
-    if ext in [".jpg", ".jpeg", ".png", ".tiff", ".tif"]:
-        return "image"
-    elif ext in [".mp4", ".mov", ".avi", ".mkv", ".mp3", ".wav", ".flac"]:
-        return "media"
-    elif ext == ".pdf":
-        return "pdf"
-    return "other"
+    return _EXT_TYPE.get(path.suffix.lower(), "other")
+
+
+def get_file_types(paths: Iterable[Path]) -> list[str]:
+    return [get_file_type(path) for path in paths]
+
+
+def _read_jpeg_exif(path: str) -> bytes | None:
+    """Return the raw Exif APP1 payload of a JPEG, or None if it has none.
+
+    Only the segment headers before the first scan are read. Raises
+    ValueError if the marker stream looks unusual, so the caller can let
+    Pillow deal with it.
+    """
+    with open(path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            raise ValueError("Not a JPEG file")
+        while True:
+            head = f.read(4)
+            if len(head) < 4 or head[0] != 0xFF:
+                raise ValueError("Unexpected JPEG marker stream")
+            marker = head[1]
+            if marker in (0xDA, 0xD9):  # SOS / EOI: no EXIF before the image data
+                return None
+            length = int.from_bytes(head[2:4], "big") - 2
+            if marker == 0xE1:
+                payload = f.read(length)
+                if payload.startswith(b"Exif\0\0"):
+                    return payload
+            else:
+                f.seek(length, os.SEEK_CUR)
 
 
 def extract_image_metadata(path: str) -> dict:
     metadata = {}
     try:
-        img = Image.open(path)
-        exif = img.getexif()
+        exif = None
+        if Path(path).suffix.lower() in _JPEG_SUFFIXES:
+            try:
+                raw = _read_jpeg_exif(path)
+            except ValueError:
+                pass
+            else:
+                exif = Image.Exif()
+                if raw:
+                    exif.load(raw)
+        if exif is None:
+            with Image.open(path) as img:
+                exif = img.getexif()
         for tag_id, value in exif.items():
             tag = ExifTags.TAGS.get(tag_id, tag_id)
             metadata[str(tag)] = value
     except Exception as e:
-        log(f"Error extracting image metadata from {path}: {e}")
+        log("Error extracting image metadata from %s: %s", path, e)
     return metadata
 
 
 def extract_pdf_metadata(path: str) -> dict:
     try:
-        with pikepdf.open(path) as pdf:
+        with pikepdf.open(path, access_mode=pikepdf.AccessMode.mmap) as pdf:
             return {str(k): str(v) for k, v in pdf.docinfo.items()}
     except Exception as e:
-        log(f"Error extracting PDF metadata from {path}: {e}")
+        log("Error extracting PDF metadata from %s: %s", path, e)
         return {}
 
 
-def extract_media_metadata(path: str) -> dict:
+def extract_media_metadata(path: str, tags: tuple[str, ...] | None = None) -> dict:
+    # ``tags`` limits the probe to those exiftool tag arguments; an empty
+    # tuple means nothing is of interest.
+    if tags is not None and not tags:
+        return {}
     try:
-        cmd = [EXIFTOOL_PATH, "-json", path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(result.stdout)[0]
-        return {str(k): str(v) for k, v in data.items()}
+        # -n skips print conversion, which only matters for display.
+        args = ("-n", *tags) if tags else ()
+        _, stdout, _ = run_exiftool("-json", *args, path)
+        # JSON object keys are already str; values are left as parsed.
+        return _json_loads(stdout)[0]
     except Exception as e:
-        log(f"Error extracting media metadata from {path}: {e}")
+        log("Error extracting media metadata from %s: %s", path, e)
         return {}
 
 
-def extract_metadata(path: str, file_type: str) -> dict:
+def _extract_metadata_uncached(path: str, file_type: str, media_tags: tuple[str, ...] | None = None) -> dict:
     if file_type == "image":
         return extract_image_metadata(path)
     elif file_type == "pdf":
         return extract_pdf_metadata(path)
     elif file_type == "media":
-        return extract_media_metadata(path)
+        return extract_media_metadata(path, media_tags)
     return {}
 
 
+# path -> ((mtime_ns, size, file_type, media_tags), metadata), least recently used first
+_META_CACHE: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+_META_CACHE_MAX = 4096
+_META_CACHE_LOCK = threading.Lock()
+
+
+def extract_metadata(path: str, file_type: str, rules: Mapping | None = None) -> dict:
+    """Return the file's metadata as a dict.
+
+    With ``rules``, media files are only probed for the tags those rules
+    can remove, which is all a lossless before/after diff needs.
+    """
+    media_tags = _media_rule_tags(rules) if rules is not None and file_type == "media" else None
+
+    # Cached per path and validated against a cheap stat, so re-probing an
+    # unchanged file (before/after a clean, View Metadata) skips the I/O.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _extract_metadata_uncached(path, file_type, media_tags)
+    stamp = (st.st_mtime_ns, st.st_size, file_type, media_tags)
+
+    with _META_CACHE_LOCK:
+        hit = _META_CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            _META_CACHE.move_to_end(path)
+            return dict(hit[1])
+
+    metadata = _extract_metadata_uncached(path, file_type, media_tags)
+
+    with _META_CACHE_LOCK:
+        _META_CACHE[path] = (stamp, metadata)
+        _META_CACHE.move_to_end(path)
+        if len(_META_CACHE) > _META_CACHE_MAX:
+            _META_CACHE.popitem(last=False)
+    return dict(metadata)
+
+
+def _forget_metadata(path: str) -> None:
+    with _META_CACHE_LOCK:
+        _META_CACHE.pop(path, None)
+
+
 # -----------------------------
 # RULES ENGINE HELPERS
 # -----------------------------
-DEFAULT_RULES = {
+DEFAULT_RULES = types.MappingProxyType({
     "remove_gps": True,
     "remove_timestamps": True,
     "remove_camera": True,
@@ -74,122 +287,462 @@ DEFAULT_RULES = {
     "remove_iptc": True,
     "keep_icc": True,
     "keep_orientation": True,
-}
+})
 
-TIMESTAMP_TAGS = {
+TIMESTAMP_TAGS = frozenset({
     "DateTime",
     "DateTimeOriginal",
     "CreateDate",
-}
+})
 
-CAMERA_TAGS = {
+CAMERA_TAGS = frozenset({
     "Make",
     "Model",
     "LensModel",
     "LensMake",
-}
+})
 
 
-def _normalize_rules(rules: dict | None) -> dict:
+def _normalize_rules(rules: Mapping | None) -> Mapping:
+    # DEFAULT_RULES is read-only, so it can be shared without copying.
     if rules is None:
-        return DEFAULT_RULES.copy()
-    merged = DEFAULT_RULES.copy()
-    merged.update(rules)
-    return merged
+        return DEFAULT_RULES
+    return {**DEFAULT_RULES, **rules}
+
+
+# rule -> exiftool tag names it removes from media files. Both the lossless
+# clean ("-TAG=") and the scoped probe ("-TAG") are built from this table,
+# so what is read always matches what is deleted. GPS* (not GPS:all) also
+# catches QuickTime Keys/UserData GPSCoordinates written by phones.
+_MEDIA_RULE_TAGS = (
+    ("remove_gps", ("GPS*",)),
+    ("remove_timestamps", ("AllDates",)),
+    ("remove_camera", ("Make", "Model", "Lens*")),
+    ("remove_xmp", ("XMP:all",)),
+    ("remove_iptc", ("IPTC:all",)),
+)
+
+
+def _media_rule_names(rules: Mapping) -> list[str]:
+    return [
+        tag
+        for rule, tags in _MEDIA_RULE_TAGS
+        if rules.get(rule, True)
+        for tag in tags
+    ]
+
+
+def _media_rule_tags(rules: Mapping) -> tuple[str, ...]:
+    # The tags clean_media_lossless can touch under ``rules``.
+    return tuple(f"-{tag}" for tag in _media_rule_names(rules))
+
+
+# Image.info entries that describe the pixels rather than the photo.
+_IMAGE_INFO_KEEP = {"transparency"}
+
+
+def _without_metadata(img: Image.Image) -> Image.Image:
+    """Drop metadata from ``img.info`` so ``img`` can be saved directly."""
+    if hasattr(img, "tag_v2"):
+        # The TIFF encoder re-emits XMP/IPTC/Photoshop tags from the source
+        # file's tag_v2, so hand it a plain in-memory copy instead (one C
+        # memcpy of the pixels, never a per-pixel Python round trip).
+        img = img.copy()
+    for key in list(img.info):
+        if key not in _IMAGE_INFO_KEEP:
+            del img.info[key]
+    return img
 
 
 # -----------------------------
-# LOSSLESS CLEAN HELPERS
+# JPEG SEGMENT REWRITING
 # -----------------------------
-def clean_image_lossless(src: Path, dst: Path, rules: dict):
-    try:
-        rules = _normalize_rules(rules)
-        img = Image.open(src)
-        exif = img.getexif()
+# Segments needed to decode the image: SOFn frames, DHT, DAC, DQT, DNL, DRI.
+_JPEG_DECODE_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC8} | {0xDB, 0xDC, 0xDD}
+# Markers that carry no length field.
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
 
-        keep_always = {"XResolution", "YResolution", "ResolutionUnit"}
-        if rules.get("keep_orientation", True):
-            keep_always.add("Orientation")
-        if rules.get("keep_icc", True):
-            keep_always.add("ICCProfile")
 
-        keys_to_delete = []
-        for tag_id, value in exif.items():
-            tag_name = ExifTags.TAGS.get(tag_id, tag_id)
+def _scan_jpeg_header(data) -> tuple[list[tuple[int, int, int]], int]:
+    """Locate the segments in front of the first scan.
 
-            if tag_name in keep_always:
-                continue
+    Returns ([(marker, start, end), ...], offset_of_first_SOS). Raises
+    ValueError for anything that doesn't parse as a baseline/progressive JPEG.
+    """
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("Not a JPEG file")
+    segments = []
+    pos = 2
+    size = len(data)
+    while True:
+        if pos + 2 > size or data[pos] != 0xFF:
+            raise ValueError("Corrupt JPEG marker stream")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0xDA:  # SOS: scan data and everything after it stay as-is
+            return segments, pos
+        if marker in _JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if pos + 4 > size:
+            raise ValueError("Truncated JPEG")
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+        if end > size:
+            raise ValueError("Truncated JPEG")
+        segments.append((marker, pos, end))
+        pos = end
 
-            if rules.get("remove_gps", True) and str(tag_name).startswith("GPS"):
-                keys_to_delete.append(tag_id)
-                continue
 
-            if rules.get("remove_timestamps", True) and tag_name in TIMESTAMP_TAGS:
-                keys_to_delete.append(tag_id)
-                continue
+def _jpeg_image_end(data, segments: list[tuple[int, int, int]], sos: int) -> int:
+    """Offset just past the EOI that ends the primary image.
 
-            if rules.get("remove_camera", True) and tag_name in CAMERA_TAGS:
-                keys_to_delete.append(tag_id)
-                continue
+    Anything after it (an MPO frame, a phone's appended JPEG/MP4 trailer)
+    can carry its own Exif/GPS, so callers stop there. Raises ValueError if
+    no EOI is found, or if an MPF segment says more images follow, so the
+    caller can leave the file to Pillow.
+    """
+    for marker, start, _ in segments:
+        if marker == 0xE2 and data[start + 4:start + 8] == b"MPF\0":
+            raise ValueError("Multi-picture JPEG")
+    size = len(data)
+    pos = sos
+    while True:
+        if pos + 2 > size or data[pos] != 0xFF:
+            raise ValueError("Corrupt JPEG marker stream")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0xD9:  # EOI
+            return pos + 2
+        if marker in _JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if pos + 4 > size:
+            raise ValueError("Truncated JPEG")
+        pos += 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+        if marker != 0xDA:  # tables between progressive scans
+            continue
+        # Entropy-coded data runs up to the first 0xFF that isn't a stuffed
+        # zero, a restart marker or a fill byte.
+        while True:
+            pos = data.find(b"\xff", pos)
+            if pos < 0 or pos + 1 >= size:
+                raise ValueError("No EOI after scan data")
+            following = data[pos + 1]
+            if following == 0x00 or 0xD0 <= following <= 0xD7:
+                pos += 2
+            elif following == 0xFF:
+                pos += 1
+            else:
+                break
 
-            if rules.get("remove_xmp", True) and "XMP" in str(tag_name):
-                keys_to_delete.append(tag_id)
-                continue
 
-            if rules.get("remove_iptc", True) and "IPTC" in str(tag_name):
-                keys_to_delete.append(tag_id)
-                continue
+def _keep_jpeg_segment(data, marker: int, start: int, keep_icc: bool) -> bool:
+    if marker in _JPEG_DECODE_MARKERS:
+        return True
+    if marker == 0xE0:
+        return data[start + 4:start + 9] == b"JFIF\0"
+    if marker == 0xEE:
+        return data[start + 4:start + 9] == b"Adobe"
+    if marker == 0xE2 and keep_icc:
+        return data[start + 4:start + 16] == b"ICC_PROFILE\0"
+    return False
+
+
+def _app1_segment(exif: bytes) -> bytes:
+    if len(exif) + 2 > 0xFFFF:
+        raise ValueError("EXIF block too large for a single APP1 segment")
+    return b"\xff\xe1" + (len(exif) + 2).to_bytes(2, "big") + exif
+
+
+def _strip_jpeg_markers(src: Path, dst: Path, keep_icc: bool = False, exif: bytes | None = None) -> None:
+    """Copy a JPEG to ``dst`` keeping only the segments needed to decode it.
+
+    The compressed scan data is copied byte-for-byte up to the primary
+    image's EOI, so nothing is re-encoded and trailing data is dropped. JFIF and Adobe (colour transform) segments are kept, ICC
+    profiles only if ``keep_icc``; every other APPn and COM segment is
+    dropped. ``exif``, if given, must start with ``b"Exif\\0\\0"`` and is
+    written as the only APP1 segment. Raises ValueError for anything that
+    doesn't parse as a baseline/progressive JPEG.
+    """
+    with open(src, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            segments, sos = _scan_jpeg_header(data)
+            eoi = _jpeg_image_end(data, segments, sos)
+            jfif = b""
+            kept = []
+            for marker, start, end in segments:
+                if not _keep_jpeg_segment(data, marker, start, keep_icc):
+                    continue
+                if marker == 0xE0 and not jfif:
+                    jfif = data[start:end]
+                else:
+                    kept.append(data[start:end])
+
+        header = [b"\xff\xd8", jfif]
+        if exif:
+            header.append(_app1_segment(exif))
+        header.extend(kept)
+
+        with open(dst, "wb") as out:
+            out.writelines(header)
+            f.seek(sos)
+            remaining = eoi - sos
+            while remaining:
+                chunk = f.read(min(remaining, 1 << 20))
+                if not chunk:
+                    raise ValueError("Truncated JPEG")
+                out.write(chunk)
+                remaining -= len(chunk)
 
-            # Any other metadata is removed in lossless mode
-            keys_to_delete.append(tag_id)
 
-        for k in keys_to_delete:
-            del exif[k]
+def _blank_jpeg_segment(data, start: int, end: int) -> None:
+    # An all-zero COM segment of the same size keeps every later offset valid.
+    data[start:start + 4] = b"\xff\xfe" + (end - start - 2).to_bytes(2, "big")
+    data[start + 4:end] = bytes(end - start - 4)
 
-        data = list(img.getdata())
-        new_img = Image.new(img.mode, img.size)
-        new_img.putdata(data)
 
-        exif_bytes = exif.tobytes()
-        new_img.save(dst, exif=exif_bytes)
+def _is_jpeg_padding(data, marker: int, start: int, end: int) -> bool:
+    # A COM segment left behind by _blank_jpeg_segment carries nothing.
+    return marker == 0xFE and not data[start + 4:end].strip(b"\0")
+
+
+def _blank_jpeg_markers(path: Path, keep_icc: bool = False, exif: bytes | None = None) -> bool:
+    """In-place variant of _strip_jpeg_markers for a freshly cloned file.
+
+    Segments that would be dropped are overwritten with zero-filled COM
+    segments of the same size, and ``exif`` is written into the space of one
+    of them, so only the metadata bytes are rewritten. Anything after the
+    primary image's EOI is truncated away. Returns False if no dropped
+    segment is big enough to take ``exif``.
+    """
+    with open(path, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0) as data:
+            segments, sos = _scan_jpeg_header(data)
+            eoi = _jpeg_image_end(data, segments, sos)
+            size = len(data)
+            dropped = [
+                (start, end) for marker, start, end in segments
+                if not _keep_jpeg_segment(data, marker, start, keep_icc)
+            ]
+            app1 = _app1_segment(exif) if exif else b""
+            slot = None
+            if app1:
+                # The leftover space must be empty or fit a COM header.
+                slot = next(
+                    ((start, end) for start, end in dropped
+                     if end - start == len(app1) or end - start >= len(app1) + 4),
+                    None,
+                )
+                if slot is None:
+                    return False
+
+            for start, end in dropped:
+                _blank_jpeg_segment(data, start, end)
+            if slot is not None:
+                start, end = slot
+                data[start:start + len(app1)] = app1
+                if end > start + len(app1):
+                    _blank_jpeg_segment(data, start + len(app1), end)
+            data.flush()
+        # Outside the mmap: a mapped file can't be resized on Windows.
+        if eoi < size:
+            f.truncate(eoi)
+    return True
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    """Make ``dst`` a copy-on-write clone of ``src`` where the filesystem allows.
+
+    Works on btrfs/XFS (Linux FICLONE) and APFS (macOS clonefile); returns
+    False everywhere else, leaving no ``dst`` behind.
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+        ficlone = 0x40049409
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), ficlone, fsrc.fileno())
+            return True
+        except OSError:
+            dst.unlink(missing_ok=True)
+            return False
+    if sys.platform == "darwin":
+        libc = ctypes.CDLL(None, use_errno=True)
+        dst.unlink(missing_ok=True)
+        return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    return False
+
+
+def _try_strip_jpeg(src: Path, dst: Path, keep_icc: bool = False, exif: bytes | None = None) -> bool:
+    if src.suffix.lower() not in _JPEG_SUFFIXES:
+        return False
+    try:
+        # On CoW filesystems clone the file and only touch the header bytes;
+        # otherwise (or if the EXIF doesn't fit) rewrite it.
+        if _try_reflink(src, dst) and _blank_jpeg_markers(dst, keep_icc=keep_icc, exif=exif):
+            return True
+        _strip_jpeg_markers(src, dst, keep_icc=keep_icc, exif=exif)
+    except ValueError as e:
+        # Never leave a clone that still carries the original metadata.
+        dst.unlink(missing_ok=True)
+        log("JPEG segment strip failed for %s, re-encoding instead: %s", src, e)
+        return False
+    except BaseException:
+        # Same for anything else (OSError from open/mmap, ...): the caller
+        # reports the failure, but dst must not survive as a full copy.
+        dst.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _strip_pdf_metadata(src: Path, dst: Path, remove_xmp: bool) -> None:
+    # Map the file instead of reading it into memory: only the trailer and
+    # catalog are touched, and unchanged objects are copied straight through.
+    with pikepdf.open(src, access_mode=pikepdf.AccessMode.mmap) as pdf:
+        if "/Info" in pdf.trailer:
+            del pdf.trailer["/Info"]
+        if remove_xmp and "/Metadata" in pdf.Root:
+            del pdf.Root["/Metadata"]
+        # Only the trailer/catalog changed: keep object streams as they are
+        # and copy content streams without decoding and recompressing them.
+        pdf.save(
+            dst,
+            linearize=False,
+            object_stream_mode=pikepdf.ObjectStreamMode.preserve,
+            stream_decode_level=pikepdf.StreamDecodeLevel.none,
+            recompress_flate=False,
+        )
+
+
+# -----------------------------
+# LOSSLESS CLEAN HELPERS
+# -----------------------------
+def clean_image_lossless(src: Path, dst: Path, rules: Mapping):
+    # ``rules`` comes already normalized from clean_file.
+    assert rules is not None
+    try:
+        with Image.open(src) as img:
+            exif = img.getexif()
+            keys_to_delete = _exif_keys_to_delete(exif, rules)
+            exif_bytes = _filtered_exif_bytes(img, exif, keys_to_delete)
+
+            if _try_strip_jpeg(src, dst, keep_icc=rules.get("keep_icc", True), exif=exif_bytes):
+                return True, "Lossless image metadata removed"
+
+            save_kwargs = {"exif": exif_bytes} if exif_bytes else {}
+            if rules.get("keep_icc", True) and img.info.get("icc_profile"):
+                save_kwargs["icc_profile"] = img.info["icc_profile"]
+            # Encoders take dpi from the save arguments, not from img.info.
+            if img.info.get("dpi"):
+                save_kwargs["dpi"] = img.info["dpi"]
+
+            out = _without_metadata(img)
+            out.save(dst, **save_kwargs)
         return True, "Lossless image metadata removed"
     except Exception as e:
         return False, str(e)
 
 
+_ORIENTATION_TAG = 0x0112
+
+
+def _orientation_exif(value: int) -> bytes:
+    # Exif header + little-endian TIFF header + one-entry IFD0 holding a
+    # SHORT Orientation value, with no next IFD.
+    return (
+        b"Exif\0\0II*\0"
+        + struct.pack("<IH", 8, 1)
+        + struct.pack("<HHIHH", _ORIENTATION_TAG, 3, 1, value, 0)
+        + struct.pack("<I", 0)
+    )
+
+
+def _single_ifd(raw: bytes) -> bool:
+    # True if the EXIF block has no IFD1 (thumbnail) chained after IFD0;
+    # Exif.tobytes() would drop one, so such blocks can't be passed through.
+    try:
+        order = "<" if raw[6:8] == b"II" else ">"
+        ifd0 = 6 + struct.unpack_from(order + "I", raw, 10)[0]
+        count = struct.unpack_from(order + "H", raw, ifd0)[0]
+        return struct.unpack_from(order + "I", raw, ifd0 + 2 + 12 * count)[0] == 0
+    except struct.error:
+        return False
+
+
+def _filtered_exif_bytes(img: Image.Image, exif, keys_to_delete: set) -> bytes:
+    """EXIF to write back after dropping ``keys_to_delete`` from ``exif``.
+
+    Re-serializing the IFD is avoided where possible: untouched EXIF is
+    passed through as the original bytes, and the common orientation-only
+    result is built directly.
+    """
+    raw = img.info.get("exif")
+    if not keys_to_delete and raw and _single_ifd(raw):
+        return raw
+    remaining = [tag_id for tag_id in exif if tag_id not in keys_to_delete]
+    if not remaining:
+        return b""
+    if remaining == [_ORIENTATION_TAG]:
+        value = exif[_ORIENTATION_TAG]
+        if isinstance(value, int) and 1 <= value <= 8:
+            return _orientation_exif(value)
+    for k in keys_to_delete:
+        del exif[k]
+    return exif.tobytes()
+
+
+@functools.lru_cache(maxsize=32)
+def _exif_keep_ids(keep_orientation: bool, keep_icc: bool) -> frozenset:
+    """EXIF tag ids that survive a lossless clean.
+
+    Every tag not kept is removed, whichever rule (GPS, timestamps, camera,
+    XMP, IPTC or none) it falls under, so only the keep flags shape the
+    result. Built once per flag combination from ExifTags.TAGS.
+    """
+    keep_always = {"XResolution", "YResolution", "ResolutionUnit"}
+    if keep_orientation:
+        keep_always.add("Orientation")
+    if keep_icc:
+        keep_always.add("ICCProfile")
+    return frozenset(
+        tag_id for tag_id, tag_name in ExifTags.TAGS.items() if tag_name in keep_always
+    )
+
+
+def _exif_keys_to_delete(exif, rules: dict) -> set:
+    keep_ids = _exif_keep_ids(
+        bool(rules.get("keep_orientation", True)),
+        bool(rules.get("keep_icc", True)),
+    )
+    # One set difference in C rather than a membership test per tag.
+    return set(exif).difference(keep_ids)
+
+
 def clean_pdf_lossless(src: Path, dst: Path, rules: dict):
     try:
-        # For now, rules do not affect PDFs; we just clear docinfo.
-        with pikepdf.open(src) as pdf:
-            pdf.docinfo.clear()
-            pdf.save(dst)
+        # Only remove_xmp applies to PDFs; the Info dictionary always goes.
+        _strip_pdf_metadata(src, dst, remove_xmp=rules.get("remove_xmp", True))
         return True, "Lossless PDF metadata removed"
     except Exception as e:
         return False, str(e)
 
 
-def clean_media_lossless(src: Path, dst: Path, rules: dict):
+def clean_media_lossless(src: Path, dst: Path, rules: Mapping):
+    # ``rules`` comes already normalized from clean_file.
+    assert rules is not None
     try:
-        rules = _normalize_rules(rules)
-        cmd = [EXIFTOOL_PATH, "-P"]
-
-        if rules.get("remove_gps", True):
-            cmd.append("-GPS*=")
-        if rules.get("remove_timestamps", True):
-            cmd.append("-AllDates=")
-        if rules.get("remove_camera", True):
-            cmd.extend(["-Make=", "-Model=", "-Lens*="])
-        if rules.get("remove_xmp", True):
-            cmd.append("-XMP:all=")
-        if rules.get("remove_iptc", True):
-            cmd.append("-IPTC:all=")
-
+        cmd = ["-P"]
+        cmd.extend(f"-{tag}=" for tag in _media_rule_names(rules))
         cmd.extend(["-o", str(dst), str(src)])
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
+        status, _, stderr = run_exiftool(*cmd)
+        if status == 0:
             return True, "Lossless media metadata removed"
-        return False, result.stderr or "ExifTool error"
+        return False, stderr or "ExifTool error"
     except Exception as e:
         return False, str(e)
 
@@ -200,11 +753,10 @@ def clean_media_lossless(src: Path, dst: Path, rules: dict):
 def clean_image_full(src: Path, dst: Path, rules: dict):
     try:
         # Full clean still nukes all metadata; rules are ignored here.
+        if _try_strip_jpeg(src, dst):
+            return True, "Image metadata removed"
         with Image.open(src) as img:
-            data = list(img.getdata())
-            new_img = Image.new(img.mode, img.size)
-            new_img.putdata(data)
-            new_img.save(dst)
+            _without_metadata(img).save(dst)
         return True, "Image metadata removed"
     except Exception as e:
         return False, str(e)
@@ -212,9 +764,7 @@ def clean_image_full(src: Path, dst: Path, rules: dict):
 
 def clean_pdf_full(src: Path, dst: Path, rules: dict):
     try:
-        with pikepdf.open(src) as pdf:
-            pdf.docinfo.clear()
-            pdf.save(dst)
+        _strip_pdf_metadata(src, dst, remove_xmp=True)
         return True, "PDF metadata removed"
     except Exception as e:
         return False, str(e)
@@ -223,34 +773,200 @@ def clean_pdf_full(src: Path, dst: Path, rules: dict):
 def clean_media_full(src: Path, dst: Path, rules: dict):
     try:
         # Full clean: remove everything via ExifTool.
-        cmd = [EXIFTOOL_PATH, "-all=", "-o", str(dst), str(src)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
+        status, _, stderr = run_exiftool("-all=", "-o", str(dst), str(src))
+        if status == 0:
             return True, "Media metadata removed"
-        return False, result.stderr or "ExifTool error"
+        return False, stderr or "ExifTool error"
     except Exception as e:
         return False, str(e)
 
 
+def clean_media_full_batch(pairs: list[tuple[Path, Path]], rules: dict) -> list[tuple[bool, str]]:
+    """Full-clean many media files with a single exiftool run.
+
+    ``pairs`` is a list of (src, dst). All commands go into one argfile,
+    separated by -execute, so exiftool starts and loads its tag tables once
+    for the whole batch. Returns one (ok, msg) per pair, in order.
+    """
+    if not pairs:
+        return []
+    lines = []
+    for i, (src, dst) in enumerate(pairs):
+        # Same trick as ExifToolSession: a numbered -echo4 line on stderr
+        # closes each command and carries its own exit status.
+        lines += ["-all=", "-o", str(dst), str(src), "-echo4", f"=${{status}}=post{i}", "-execute"]
+
+    fd, argfile = tempfile.mkstemp(suffix=".args", text=True)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("".join(f"{line}\n" for line in lines))
+        proc = subprocess.run(
+            # Options before -@ only reach the first -execute block;
+            # -common_args applies them to every command in the argfile.
+            [EXIFTOOL_PATH, "-@", argfile, "-common_args", "-charset", "filename=utf8"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            creationflags=_NO_WINDOW,
+        )
+    except Exception as e:
+        return [(False, str(e))] * len(pairs)
+    finally:
+        os.unlink(argfile)
+
+    results = []
+    errors = []
+    for line in proc.stderr.decode("utf-8", errors="replace").splitlines():
+        if line.startswith("=") and "=post" in line:
+            status = line.rsplit("=", 2)[-2]
+            if status == "0":
+                results.append((True, "Media metadata removed"))
+            else:
+                results.append((False, "\n".join(errors) or "ExifTool error"))
+            errors = []
+        else:
+            errors.append(line)
+    # Commands exiftool never got to (it died part-way) count as failures.
+    msg = "\n".join(errors) or f"ExifTool exited with status {proc.returncode}"
+    results += [(False, msg)] * (len(pairs) - len(results))
+    return results
+
+
+# -----------------------------
+# ALREADY-CLEAN CHECK
+# -----------------------------
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Chunks that describe the pixels rather than the photo.
+_PNG_PIXEL_CHUNKS = frozenset({
+    b"IHDR", b"PLTE", b"tRNS", b"IDAT", b"IEND",
+    b"pHYs", b"gAMA", b"cHRM", b"sRGB", b"sBIT", b"bKGD",
+})
+
+
+def _jpeg_has_metadata(data, rules: Mapping, lossless: bool, keep_icc: bool) -> bool:
+    # ``data`` is the whole file: a JPEG is only clean if it also ends at
+    # the primary image's EOI, with no MPF frames or trailer behind it.
+    try:
+        segments, sos = _scan_jpeg_header(data)
+        if _jpeg_image_end(data, segments, sos) != len(data):
+            return True
+    except ValueError:
+        return True
+    for marker, start, end in segments:
+        if _keep_jpeg_segment(data, marker, start, keep_icc):
+            continue
+        if _is_jpeg_padding(data, marker, start, end):
+            continue
+        if lossless and marker == 0xE1 and data[start + 4:start + 10] == b"Exif\0\0":
+            # A lossless clean writes EXIF back; it's only clean if
+            # filtering would leave it exactly as it is.
+            raw = data[start + 4:end]
+            exif = Image.Exif()
+            exif.load(raw)
+            if not _exif_keys_to_delete(exif, rules) and _single_ifd(raw):
+                continue
+        return True
+    return False
+
+
+def _png_has_metadata(f, keep_icc: bool) -> bool:
+    # Walk the chunk headers only, seeking over the data.
+    f.seek(len(_PNG_SIGNATURE))
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            return True
+        chunk_type = head[4:]
+        if chunk_type == b"IEND":
+            return False
+        if chunk_type not in _PNG_PIXEL_CHUNKS and not (keep_icc and chunk_type == b"iCCP"):
+            return True
+        f.seek(int.from_bytes(head[:4], "big") + 4, os.SEEK_CUR)
+
+
+def _has_sensitive_metadata(src: Path, file_type: str, rules: Mapping, lossless: bool) -> bool:
+    """Whether cleaning ``src`` would remove anything.
+
+    Only answers False when that can be shown cheaply; anything unusual,
+    unreadable or not understood counts as having metadata, so the file
+    goes through the normal clean.
+    """
+    try:
+        if file_type == "image":
+            keep_icc = lossless and rules.get("keep_icc", True)
+            with open(src, "rb") as f:
+                magic = f.read(len(_PNG_SIGNATURE))
+                if magic.startswith(b"\xff\xd8"):
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        return _jpeg_has_metadata(data, rules, lossless, keep_icc)
+                if magic == _PNG_SIGNATURE:
+                    return _png_has_metadata(f, keep_icc)
+            return True
+        if file_type == "pdf":
+            with pikepdf.open(src, access_mode=pikepdf.AccessMode.mmap) as pdf:
+                info = pdf.trailer.get("/Info")
+                if info is not None and len(info.keys()):
+                    return True
+                remove_xmp = not lossless or rules.get("remove_xmp", True)
+                return bool(remove_xmp) and "/Metadata" in pdf.Root
+        if file_type == "media" and lossless:
+            # The probe reads exactly the tags clean_media_lossless deletes
+            # (both come from _MEDIA_RULE_TAGS); it is the same scoped probe
+            # as a lossless diff, so the cache serves both.
+            if not _media_rule_names(rules):
+                return False
+            metadata = extract_metadata(str(src), file_type, rules=rules)
+            # SourceFile is always present unless the probe itself failed.
+            return "SourceFile" not in metadata or len(metadata) > 1
+    except Exception:
+        pass
+    return True
+
+
 # -----------------------------
 # MAIN CLEAN FUNCTION
 # -----------------------------
+def _clean_dst(src: Path, overwrite: bool, lossless: bool) -> Path:
+    if overwrite:
+        tmp_suffix = ".tmp_clean_lossless" if lossless else ".tmp_clean"
+        return src.with_suffix(src.suffix + tmp_suffix)
+    suffix = "_cleaned_lossless" if lossless else "_cleaned"
+    return src.with_name(src.stem + suffix + src.suffix)
+
+
+def _finish_clean(path: str, dst: Path, ok: bool, msg: str, overwrite: bool):
+    if ok and overwrite:
+        _forget_metadata(path)
+        dst.replace(path)
+        log("Clean successful (overwritten): %s", path)
+        return True, msg, str(Path(path))
+
+    if ok:
+        log("Clean successful: %s", dst)
+    else:
+        log("Clean failed for %s: %s", path, msg)
+
+    return ok, msg, str(dst)
+
+
 def clean_file(path: str, overwrite: bool = False, lossless: bool = False, rules: dict | None = None):
     src = Path(path)
     if not src.exists():
-        log(f"File not found: {path}")
+        log("File not found: %s", path)
         return False, "File not found", path
 
     rules = _normalize_rules(rules)
     file_type = get_file_type(src)
-    log(f"Starting {'lossless' if lossless else 'full'} clean for {path} (type: {file_type}, rules={rules})")
+    log(
+        "Starting %s clean for %s (type: %s, rules=%s)",
+        "lossless" if lossless else "full", path, file_type, rules,
+    )
 
-    if overwrite:
-        tmp_suffix = ".tmp_clean_lossless" if lossless else ".tmp_clean"
-        dst = src.with_suffix(src.suffix + tmp_suffix)
-    else:
-        suffix = "_cleaned_lossless" if lossless else "_cleaned"
-        dst = src.with_name(src.stem + suffix + src.suffix)
+    # Re-running over an already-cleaned library shouldn't rewrite every file.
+    if not _has_sensitive_metadata(src, file_type, rules, lossless):
+        log("Nothing to remove, leaving as-is: %s", path)
+        return True, "Already clean", path
+
+    dst = _clean_dst(src, overwrite, lossless)
 
     if lossless:
         if file_type == "image":
@@ -260,7 +976,7 @@ def clean_file(path: str, overwrite: bool = False, lossless: bool = False, rules
         elif file_type == "media":
             ok, msg = clean_media_lossless(src, dst, rules)
         else:
-            log(f"Unsupported file type for lossless clean: {path}")
+            log("Unsupported file type for lossless clean: %s", path)
             return False, "Unsupported file type", str(src)
     else:
         if file_type == "image":
@@ -270,27 +986,90 @@ def clean_file(path: str, overwrite: bool = False, lossless: bool = False, rules
         elif file_type == "media":
             ok, msg = clean_media_full(src, dst, rules)
         else:
-            log(f"Unsupported file type for full clean: {path}")
+            log("Unsupported file type for full clean: %s", path)
             return False, "Unsupported file type", str(src)
 
-    if ok and overwrite:
-        dst.replace(src)
-        log(f"Clean successful (overwritten): {path}")
-        return True, msg, str(src)
+    return _finish_clean(path, dst, ok, msg, overwrite)
 
-    if ok:
-        log(f"Clean successful: {dst}")
-    else:
-        log(f"Clean failed for {path}: {msg}")
 
-    return ok, msg, str(dst)
+def _init_clean_worker() -> None:
+    global _SESSION
+    # A forked worker inherits the parent's session object; it must start
+    # its own (lazily, in run_exiftool, so image/PDF-only batches never
+    # start exiftool at all) rather than talk over the parent's pipes.
+    _SESSION = None
+    # atexit hooks don't run in pool workers (they leave via os._exit), but
+    # multiprocessing's finalizers do, so close the session through one.
+    multiprocessing.util.Finalize(None, _close_session, exitpriority=10)
+
+
+def clean_files(paths: list[str], overwrite: bool = False, lossless: bool = False,
+                rules: dict | None = None, workers: int | None = None):
+    """Clean many files in parallel worker processes.
+
+    Returns one (ok, msg, out_path) tuple per input path, in input order.
+    Processes rather than threads, so Pillow/pikepdf work isn't serialized
+    by the GIL and each worker drives its own exiftool. For a full clean,
+    media files skip the pool and go to one clean_media_full_batch() run.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    workers = workers or os.cpu_count() or 1
+    # A MappingProxy (e.g. DEFAULT_RULES itself) can't be pickled to the workers.
+    rules = dict(rules) if rules is not None else None
+    job = functools.partial(clean_file, overwrite=overwrite, lossless=lossless, rules=rules)
+
+    batched = [] if lossless else [
+        i for i, path in enumerate(paths)
+        if get_file_type(Path(path)) == "media" and os.path.exists(path)
+    ]
+    pooled = sorted(set(range(len(paths))) - set(batched))
+    results = [None] * len(paths)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_clean_worker) as executor:
+        pending = executor.map(job, [paths[i] for i in pooled],
+                               chunksize=max(1, len(pooled) // (workers * 4)))
+        # The pool works in the background while exiftool runs here.
+        if batched:
+            dsts = [_clean_dst(Path(paths[i]), overwrite, lossless) for i in batched]
+            log("Starting full clean for %d media files in one exiftool run", len(batched))
+            outcomes = clean_media_full_batch([(Path(paths[i]), dst) for i, dst in zip(batched, dsts)], rules)
+            for i, dst, (ok, msg) in zip(batched, dsts, outcomes):
+                results[i] = _finish_clean(paths[i], dst, ok, msg, overwrite)
+        for i, result in zip(pooled, pending):
+            results[i] = result
+    elapsed = time.perf_counter() - start
+
+    log(
+        "Batch clean of %d files finished in %.2fs with %d workers (%d failed)",
+        len(paths), elapsed, workers, sum(1 for ok, _, _ in results if not ok),
+    )
+    return results
+
+
+def clean_file_with_diff(path: str, overwrite: bool = False, lossless: bool = False, rules: dict | None = None):
+    """Like clean_file, but also returns the before/after metadata snapshots.
+
+    Returns (ok, msg, out_path, before, after); ``after`` is empty on failure.
+    """
+    file_type = get_file_type(Path(path))
+    # A full clean removes everything, so only a lossless diff can be scoped.
+    scope = _normalize_rules(rules) if lossless else None
+    before = extract_metadata(path, file_type, rules=scope)
+    ok, msg, out_path = clean_file(path, overwrite=overwrite, lossless=lossless, rules=rules)
+    after = extract_metadata(out_path, file_type, rules=scope) if ok else {}
+    # exiftool's SourceFile is the path probed, not metadata; it differs
+    # whenever the output is a new file and would always show as removed.
+    before.pop("SourceFile", None)
+    after.pop("SourceFile", None)
+    return ok, msg, out_path, before, after
+
+
+_MISSING = object()
 
 
 def compare_metadata(before: dict, after: dict) -> dict:
-    removed = {}
-    for key, value in before.items():
-        if key not in after:
-            removed[key] = value
-        elif after.get(key) != value:
-            removed[key] = value
-    return removed
+    # Entries that were dropped or changed, in the order of ``before``.
+    return {k: v for k, v in before.items() if after.get(k, _MISSING) != v}